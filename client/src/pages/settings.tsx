@@ -308,7 +308,7 @@ export default function Settings() {
                     <Badge variant="secondary">Built-in</Badge>
                   </div>
                   <p className="text-sm text-muted-foreground mb-3">
-                    Free price data for stocks, ETFs, and crypto via yfinance.
+                    Free price data for stocks, ETFs, and crypto via Yahoo Finance.
                   </p>
                   <Button variant="outline" size="sm" disabled>
                     Active
@@ -1,13 +1,326 @@
-import json
+import asyncio
+import bisect
+import socket
+import struct
 import sys
-import yfinance as yf
+import threading
+import time
+import aiohttp
+import orjson
+import redis
+from redis import asyncio as redis_async
+from rapidfuzz import fuzz, process
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 import os
 
-def fetch_equity_price(symbol: str) -> Dict[str, Any]:
-    """Fetch equity/ETF price using Alpha Vantage API with yfinance fallback"""
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+YAHOO_QUOTE_SUMMARY_URL = "https://query2.finance.yahoo.com/v10/finance/quoteSummary/{symbol}"
+YAHOO_HEADERS = {"User-Agent": "Mozilla/5.0"}
+# Only the price module carries longName/marketCap; formatted=false returns bare
+# numbers instead of {raw, fmt, longFmt} objects to keep the payload small
+QUOTE_SUMMARY_PARAMS = {"modules": "price", "formatted": "false"}
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=10, sock_connect=3)
+REQUESTS_TIMEOUT = (3, 10)  # (connect, read) seconds
+
+# Daemon mode (`python main.py serve`) listens here for framed JSON requests
+SOCKET_PATH = os.getenv("PRICE_SERVICE_SOCKET", "/tmp/finai.sock")
+FRAME_HEADER = struct.Struct(">I")
+# Requests are a few hundred bytes; anything bigger is a corrupt header
+MAX_FRAME_BYTES = 1 << 20
+# Polled by the /api/sentiment route on every request
+WARMUP_INTRADAY_SYMBOLS = ("^VIX", "^TNX", "SPY")
+
+# Long-lived session so sync calls reuse keep-alive connections instead of
+# paying a TCP+TLS handshake per request
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Symbol mapping for crypto, and its read-only reverse for CoinGecko id lookups
+CRYPTO_SYMBOL_MAP: Mapping[str, str] = MappingProxyType({
+    "BTC-USD": "bitcoin",
+    "ETH-USD": "ethereum",
+    "ADA-USD": "cardano",
+    "SOL-USD": "solana"
+})
+REVERSE_CRYPTO_MAP: Mapping[str, str] = MappingProxyType({v: k for k, v in CRYPTO_SYMBOL_MAP.items()})
+
+# Cache TTLs in seconds; keys are bucketed at half the TTL so an entry is
+# never served more than one TTL after it was fetched
+PRICE_CACHE_TTL_SEC = 60
+SUMMARY_CACHE_TTL_SEC = 300
+INTRADAY_CACHE_TTL_SEC = 90
+# Failed (delisted, mistyped) symbols are not retried upstream for this long
+NEGATIVE_CACHE_TTL_SEC = 120
+# Values read back from Redis have an unknown remaining TTL, so L1 keeps them briefly
+L1_CACHE_TTL_SEC = 15
+# After a Redis error, run on L1 alone for this long before trying Redis again
+REDIS_RETRY_SEC = 30
+
+# Redis is shared with other workers; the in-process dict (L1) skips the Redis
+# round-trip for repeated lookups within the same process. Sync fetchers run in
+# worker threads and use the blocking client; coroutines use the asyncio one so
+# a slow Redis never stalls the event loop.
+_REDIS_OPTIONS = {
+    "host": os.getenv("REDIS_HOST", "localhost"),
+    "port": int(os.getenv("REDIS_PORT", "6379")),
+    "decode_responses": True,
+    "socket_connect_timeout": 0.25,
+    "socket_timeout": 0.5
+}
+_redis = redis.Redis(**_REDIS_OPTIONS)
+_redis_async = redis_async.Redis(**_REDIS_OPTIONS)
+_redis_retry_at = 0.0
+_redis_down = False
+
+# L1 is shared between the event loop and asyncio.to_thread workers
+_l1_lock = threading.Lock()
+_l1_cache: Dict[str, Tuple[float, Any]] = {}
+_negative_cache_hits: Counter = Counter()
+
+def cache_key(prefix: str, symbol: str, ttl: int) -> str:
+    """Build a cache key for symbol in the current time bucket"""
+    return f"{prefix}:{symbol}:{int(time.time() // (ttl // 2))}"
+
+def _l1_get(key: str) -> Any:
+    """Read key from the L1 cache; returns None on miss or expiry"""
+    with _l1_lock:
+        entry = _l1_cache.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at > time.time():
+            return value
+        
+        _l1_cache.pop(key, None)
+        return None
+
+def _l1_set(key: str, value: Any, ttl: int) -> None:
+    """Write value to the L1 cache with the given TTL"""
+    with _l1_lock:
+        _l1_cache[key] = (time.time() + ttl, value)
+
+def _promote(key: str, cached: Optional[str]) -> Any:
+    """Decode a Redis hit and keep it briefly in L1"""
+    if cached is None:
+        return None
+    
+    value = orjson.loads(cached)
+    _l1_set(key, value, L1_CACHE_TTL_SEC)
+    return value
+
+def _redis_available() -> bool:
+    """False while backing off after a Redis error"""
+    return time.time() >= _redis_retry_at
+
+def _redis_failed(error: Exception) -> None:
+    """Redis is optional - fall back to L1 alone and retry after a cooldown"""
+    global _redis_retry_at, _redis_down
+    
+    # Concurrent callers may fail together; log once per cooldown window
+    if _redis_available():
+        print(f"Redis unavailable, caching in-process only for {REDIS_RETRY_SEC}s: {error}", file=sys.stderr)
+    _redis_down = True
+    _redis_retry_at = time.time() + REDIS_RETRY_SEC
+
+def _redis_succeeded() -> None:
+    """Log once when Redis answers again after an outage"""
+    global _redis_down
+    
+    if _redis_down:
+        _redis_down = False
+        print("Redis reachable again", file=sys.stderr)
+
+def cache_get(key: str) -> Any:
+    """Read key from the L1 cache, then Redis; returns None on miss"""
+    value = _l1_get(key)
+    if value is not None or not _redis_available():
+        return value
+    
+    try:
+        cached = _redis.get(key)
+    except redis.RedisError as e:
+        _redis_failed(e)
+        return None
+    
+    _redis_succeeded()
+    return _promote(key, cached)
+
+async def cache_get_async(key: str) -> Any:
+    """Non-blocking cache_get for coroutines"""
+    value = _l1_get(key)
+    if value is not None or not _redis_available():
+        return value
+    
+    try:
+        cached = await _redis_async.get(key)
+    except redis.RedisError as e:
+        _redis_failed(e)
+        return None
+    
+    _redis_succeeded()
+    return _promote(key, cached)
+
+def prune_l1_cache() -> None:
+    """Drop expired L1 entries; bucketed keys are never read again once stale"""
+    now = time.time()
+    # Worker threads write L1 concurrently, so iterate under the lock
+    with _l1_lock:
+        for key in [key for key, (expires_at, _) in _l1_cache.items() if expires_at <= now]:
+            _l1_cache.pop(key, None)
+
+def cache_set(key: str, value: Any, ttl: int) -> None:
+    """Write value to the L1 cache and Redis with the given TTL"""
+    _l1_set(key, value, ttl)
+    if not _redis_available():
+        return
+    
+    try:
+        _redis.setex(key, ttl, orjson.dumps(value))
+    except redis.RedisError as e:
+        _redis_failed(e)
+        return
+    
+    _redis_succeeded()
+
+async def cache_set_async(key: str, value: Any, ttl: int) -> None:
+    """Non-blocking cache_set for coroutines"""
+    _l1_set(key, value, ttl)
+    if not _redis_available():
+        return
+    
+    try:
+        await _redis_async.setex(key, ttl, orjson.dumps(value))
+    except redis.RedisError as e:
+        _redis_failed(e)
+        return
+    
+    _redis_succeeded()
+
+class SymbolNotFoundError(ValueError):
+    """Upstream answered but has no data for the symbol (delisted, mistyped)"""
+
+def _count_negative_hit(kind: str, symbol: str) -> None:
+    """Record a negative cache hit on stderr"""
+    with _l1_lock:
+        _negative_cache_hits[kind] += 1
+        hits = _negative_cache_hits[kind]
+    print(f"Negative cache hit for {kind}:{symbol} ({hits} {kind} hits)", file=sys.stderr)
+
+def is_known_failure(kind: str, symbol: str) -> bool:
+    """Check whether symbol recently failed to resolve, counting hits on stderr"""
+    if cache_get(f"neg:{kind}:{symbol}") is None:
+        return False
+    
+    _count_negative_hit(kind, symbol)
+    return True
+
+async def is_known_failure_async(kind: str, symbol: str) -> bool:
+    """Non-blocking is_known_failure for coroutines"""
+    if await cache_get_async(f"neg:{kind}:{symbol}") is None:
+        return False
+    
+    _count_negative_hit(kind, symbol)
+    return True
+
+# Only call the remember_failure helpers for SymbolNotFoundError - timeouts,
+# 429s and 5xx are transient and must not black out a valid symbol
+
+def remember_failure(kind: str, symbol: str) -> None:
+    """Skip upstream lookups for symbol until the negative cache entry expires"""
+    cache_set(f"neg:{kind}:{symbol}", 1, NEGATIVE_CACHE_TTL_SEC)
+
+async def remember_failure_async(kind: str, symbol: str) -> None:
+    """Non-blocking remember_failure for coroutines"""
+    await cache_set_async(f"neg:{kind}:{symbol}", 1, NEGATIVE_CACHE_TTL_SEC)
+
+def _yahoo_chart(symbol: str, range_: str, interval: str) -> Dict[str, Any]:
+    """Sync counterpart of _yahoo_chart_async over the pooled requests session"""
+    response = _session.get(
+        YAHOO_CHART_URL.format(symbol=symbol),
+        params={"range": range_, "interval": interval},
+        headers=YAHOO_HEADERS,
+        timeout=REQUESTS_TIMEOUT
+    )
+    if response.status_code == 404:
+        raise SymbolNotFoundError(f"No data found for {symbol}")
+    response.raise_for_status()
+    
+    result = (orjson.loads(response.content).get("chart") or {}).get("result") or []
+    if not result:
+        raise SymbolNotFoundError(f"No data found for {symbol}")
+    
+    return result[0]
+
+def _yahoo_candles(chart: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Zip a Yahoo chart result's timestamp and OHLCV arrays into candle dicts"""
+    quote = (chart.get("indicators", {}).get("quote") or [{}])[0]
+    
+    # Yahoo pads gaps (halts, the current unfinished bar) with nulls
+    return [
+        {"ts": ts * 1000, "open": o, "high": h, "low": l, "close": c, "volume": int(v or 0)}
+        for ts, o, h, l, c, v in zip(
+            chart.get("timestamp") or [],
+            quote.get("open") or [],
+            quote.get("high") or [],
+            quote.get("low") or [],
+            quote.get("close") or [],
+            quote.get("volume") or []
+        )
+        if c is not None
+    ]
+
+async def _yahoo_get_json(session: aiohttp.ClientSession, url: str, params: Dict[str, str]) -> Dict[str, Any]:
+    """GET a Yahoo Finance endpoint and decode the JSON body"""
+    async with session.get(url, params=params, headers=YAHOO_HEADERS) as response:
+        if response.status == 404:
+            raise SymbolNotFoundError(f"No data found at {url}")
+        response.raise_for_status()
+        return orjson.loads(await response.read())
+
+async def _yahoo_chart_async(session: aiohttp.ClientSession, symbol: str, range_: str, interval: str) -> Dict[str, Any]:
+    """Fetch the first chart result for symbol from Yahoo's v8 chart endpoint"""
+    data = await _yahoo_get_json(session, YAHOO_CHART_URL.format(symbol=symbol), {"range": range_, "interval": interval})
+    
+    result = (data.get("chart") or {}).get("result") or []
+    if not result:
+        raise SymbolNotFoundError(f"No data found for {symbol}")
+    
+    return result[0]
+
+async def fetch_equity_price_async(session: aiohttp.ClientSession, symbol: str) -> Dict[str, Any]:
+    """Fetch equity/ETF price, served from cache while fresh"""
+    key = cache_key("px:eq", symbol, PRICE_CACHE_TTL_SEC)
+    cached = await cache_get_async(key)
+    if cached is not None:
+        return cached
+    
+    if await is_known_failure_async("eq", symbol):
+        return None
+    
+    try:
+        result = await _fetch_equity_price_live(session, symbol)
+    except SymbolNotFoundError as e:
+        print(f"Error fetching {symbol}: {e}", file=sys.stderr)
+        await remember_failure_async("eq", symbol)
+        return None
+    
+    if result:
+        await cache_set_async(key, result, PRICE_CACHE_TTL_SEC)
+    return result
+
+async def _fetch_equity_price_live(session: aiohttp.ClientSession, symbol: str) -> Dict[str, Any]:
+    """Fetch equity/ETF price using Alpha Vantage API with Yahoo chart fallback"""
     try:
         alpha_vantage_key = os.getenv("ALPHA_VANTAGE_API_KEY")
         
@@ -21,10 +334,10 @@ def fetch_equity_price(symbol: str) -> Dict[str, Any]:
                     "apikey": alpha_vantage_key
                 }
                 
-                response = requests.get(url, params=params)
-                response.raise_for_status()
+                async with session.get(url, params=params) as response:
+                    response.raise_for_status()
+                    data = orjson.loads(await response.read())
                 
-                data = response.json()
                 if "Global Quote" in data and "05. price" in data["Global Quote"]:
                     return {
                         "symbol": symbol,
@@ -36,33 +349,54 @@ def fetch_equity_price(symbol: str) -> Dict[str, Any]:
             except Exception as e:
                 print(f"Alpha Vantage failed for {symbol}: {e}", file=sys.stderr)
         
-        # Fallback to yfinance
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period="1d")
+        # Fallback to Yahoo's chart endpoint
+        chart = await _yahoo_chart_async(session, symbol, "1d", "1d")
         
-        if hist.empty:
-            raise ValueError(f"No data found for {symbol}")
+        meta = chart["meta"]
+        latest_price = meta.get("regularMarketPrice")
+        if latest_price is None:
+            raise SymbolNotFoundError(f"No data found for {symbol}")
         
-        latest_price = hist['Close'].iloc[-1]
-        latest_date = hist.index[-1].date().strftime('%Y-%m-%d')
+        latest_date = datetime.fromtimestamp(meta["regularMarketTime"]).strftime('%Y-%m-%d')
         
         return {
             "symbol": symbol,
             "assetType": "equity",  # Will be corrected by calling code
             "close": float(latest_price),
             "date": latest_date,
-            "source": "yfinance"
+            "source": "yahoo"
         }
+    except SymbolNotFoundError:
+        raise
     except Exception as e:
         print(f"Error fetching {symbol}: {e}", file=sys.stderr)
         return None
 
-def fetch_crypto_price(coingecko_id: str, symbol_map: Dict[str, str]) -> Dict[str, Any]:
-    """Fetch crypto price using CoinGecko API"""
+async def fetch_crypto_prices_bulk_async(session: aiohttp.ClientSession, coingecko_ids: List[str], id_to_symbol: Mapping[str, str] = REVERSE_CRYPTO_MAP) -> List[Dict[str, Any]]:
+    """Fetch crypto prices for all CoinGecko ids in a single /simple/price request"""
+    prices: Dict[str, Dict[str, Any]] = {}
+    missing_ids = []
+    cached_prices = await asyncio.gather(*[
+        cache_get_async(cache_key("px:cx", coingecko_id, PRICE_CACHE_TTL_SEC)) for coingecko_id in coingecko_ids
+    ])
+    for coingecko_id, cached in zip(coingecko_ids, cached_prices):
+        if cached is not None:
+            prices[coingecko_id] = cached
+        elif not await is_known_failure_async("cx", coingecko_id):
+            missing_ids.append(coingecko_id)
+    
+    if missing_ids:
+        prices.update(await _fetch_crypto_prices_live(session, missing_ids, id_to_symbol))
+    
+    # Keep the caller's input order regardless of which ids were cached
+    return [prices[coingecko_id] for coingecko_id in coingecko_ids if coingecko_id in prices]
+
+async def _fetch_crypto_prices_live(session: aiohttp.ClientSession, coingecko_ids: List[str], id_to_symbol: Mapping[str, str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch prices for coingecko_ids from CoinGecko, keyed by id"""
     try:
         url = f"https://api.coingecko.com/api/v3/simple/price"
         params = {
-            "ids": coingecko_id,
+            "ids": ",".join(coingecko_ids),
             "vs_currencies": "usd"
         }
         
@@ -71,119 +405,238 @@ def fetch_crypto_price(coingecko_id: str, symbol_map: Dict[str, str]) -> Dict[st
         if coingecko_key:
             headers["x-cg-demo-api-key"] = coingecko_key
         
-        response = requests.get(url, params=params, headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
-        if coingecko_id not in data:
-            raise ValueError(f"No data found for {coingecko_id}")
-        
-        price = data[coingecko_id]["usd"]
+        async with session.get(url, params=params, headers=headers) as response:
+            response.raise_for_status()
+            data = orjson.loads(await response.read())
+    except Exception as e:
+        print(f"Error fetching {','.join(coingecko_ids)}: {e}", file=sys.stderr)
+        return {}
+    
+    today = datetime.now().strftime('%Y-%m-%d')
+    prices = {}
+    for coingecko_id in coingecko_ids:
+        if coingecko_id not in data or "usd" not in data[coingecko_id]:
+            print(f"Error fetching {coingecko_id}: No data found for {coingecko_id}", file=sys.stderr)
+            await remember_failure_async("cx", coingecko_id)
+            continue
         
         # Map back to symbol
-        symbol = None
-        for k, v in symbol_map.items():
-            if v == coingecko_id:
-                symbol = k
-                break
+        symbol = id_to_symbol.get(coingecko_id) or f"{coingecko_id.upper()}-USD"
         
-        if not symbol:
-            symbol = f"{coingecko_id.upper()}-USD"
-        
-        return {
+        price_data = {
             "symbol": symbol,
             "assetType": "crypto",
-            "close": float(price),
-            "date": datetime.now().strftime('%Y-%m-%d'),
+            "close": float(data[coingecko_id]["usd"]),
+            "date": today,
             "source": "coingecko"
         }
-    except Exception as e:
-        print(f"Error fetching {coingecko_id}: {e}", file=sys.stderr)
-        return None
+        await cache_set_async(cache_key("px:cx", coingecko_id, PRICE_CACHE_TTL_SEC), price_data, PRICE_CACHE_TTL_SEC)
+        prices[coingecko_id] = price_data
+    
+    return prices
+
+def create_http_session() -> aiohttp.ClientSession:
+    """Create the pooled aiohttp session shared by all async fetchers"""
+    connector = aiohttp.TCPConnector(limit=32)
+    return aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT)
+
+async def fetch_batch_prices(session: aiohttp.ClientSession, equities: List[str], cryptos: List[str]) -> List[Dict[str, Any]]:
+    """Fetch all equity and crypto prices concurrently over one pooled session"""
+    # Yahoo/Alpha Vantage and CoinGecko are independent upstreams, so the two
+    # sub-batches overlap and wall time is the slower of the two, not the sum
+    equity_batch = asyncio.gather(*[fetch_equity_price_async(session, symbol) for symbol in equities])
+    crypto_batch = fetch_crypto_prices_bulk_async(session, cryptos)
+    
+    equity_results, crypto_results = await asyncio.gather(equity_batch, crypto_batch)
+    
+    return [price_data for price_data in equity_results if price_data] + crypto_results
+
+# Mock search universe - in production, would use proper search API
+MOCK_SECURITIES = [
+    {"symbol": "AAPL", "name": "Apple Inc.", "exchange": "NASDAQ", "type": "equity"},
+    {"symbol": "MSFT", "name": "Microsoft Corporation", "exchange": "NASDAQ", "type": "equity"},
+    {"symbol": "GOOGL", "name": "Alphabet Inc.", "exchange": "NASDAQ", "type": "equity"},
+    {"symbol": "AMZN", "name": "Amazon.com Inc.", "exchange": "NASDAQ", "type": "equity"},
+    {"symbol": "TSLA", "name": "Tesla Inc.", "exchange": "NASDAQ", "type": "equity"},
+    {"symbol": "SPY", "name": "SPDR S&P 500 ETF Trust", "exchange": "NYSE", "type": "etf"},
+    {"symbol": "QQQ", "name": "Invesco QQQ Trust", "exchange": "NASDAQ", "type": "etf"},
+    {"symbol": "VTI", "name": "Vanguard Total Stock Market ETF", "exchange": "NYSE", "type": "etf"},
+    {"symbol": "IVV", "name": "iShares Core S&P 500 ETF", "exchange": "NYSE", "type": "etf"},
+    {"symbol": "VOO", "name": "Vanguard S&P 500 ETF", "exchange": "NYSE", "type": "etf"},
+]
+
+SEARCH_CACHE_TTL_SEC = 3600
+SEARCH_FUZZY_SCORE_CUTOFF = 70
+
+# Search index built once at import: exact symbol lookup, sorted symbols for
+# prefix range scans, lowercased (symbol, name, row) for substring matches and
+# joined "symbol name" strings for fuzzy matching
+_symbol_to_row = {sec["symbol"].lower(): sec for sec in MOCK_SECURITIES}
+_sorted_symbols = sorted(_symbol_to_row)
+_search_rows = [(sec["symbol"].lower(), sec["name"].lower(), sec) for sec in MOCK_SECURITIES]
+_search_choices = [f"{symbol} {name}" for symbol, name, _ in _search_rows]
 
 def search_equity_symbols(query: str, limit: int = 10) -> List[Dict[str, Any]]:
-    """Search for equity/ETF symbols using yfinance"""
+    """Search for equity/ETF symbols by ticker prefix, then name, then fuzzy match"""
     try:
-        # Mock search implementation - in production, would use proper search API
-        # For now, return a static list filtered by query
-        mock_securities = [
-            {"symbol": "AAPL", "name": "Apple Inc.", "exchange": "NASDAQ", "type": "equity"},
-            {"symbol": "MSFT", "name": "Microsoft Corporation", "exchange": "NASDAQ", "type": "equity"},
-            {"symbol": "GOOGL", "name": "Alphabet Inc.", "exchange": "NASDAQ", "type": "equity"},
-            {"symbol": "AMZN", "name": "Amazon.com Inc.", "exchange": "NASDAQ", "type": "equity"},
-            {"symbol": "TSLA", "name": "Tesla Inc.", "exchange": "NASDAQ", "type": "equity"},
-            {"symbol": "SPY", "name": "SPDR S&P 500 ETF Trust", "exchange": "NYSE", "type": "etf"},
-            {"symbol": "QQQ", "name": "Invesco QQQ Trust", "exchange": "NASDAQ", "type": "etf"},
-            {"symbol": "VTI", "name": "Vanguard Total Stock Market ETF", "exchange": "NYSE", "type": "etf"},
-            {"symbol": "IVV", "name": "iShares Core S&P 500 ETF", "exchange": "NYSE", "type": "etf"},
-            {"symbol": "VOO", "name": "Vanguard S&P 500 ETF", "exchange": "NYSE", "type": "etf"},
-        ]
-        
-        # Filter by query (case insensitive)
-        query_lower = query.lower()
-        filtered = [
-            sec for sec in mock_securities 
-            if query_lower in sec["symbol"].lower() or query_lower in sec["name"].lower()
-        ]
-        
-        return filtered[:limit]
+        query_lower = query.lower().strip()
+        key = f"search:{query_lower}:{limit}"
+        cached = cache_get(key)
+        if cached is not None:
+            return cached
+        
+        matches: Dict[str, Dict[str, Any]] = {}
+        
+        # Exact and prefix ticker hits first; an empty query skips this so it
+        # lists every row in universe order rather than sorted by ticker
+        if query_lower:
+            start = bisect.bisect_left(_sorted_symbols, query_lower)
+            for symbol in _sorted_symbols[start:]:
+                if not symbol.startswith(query_lower) or len(matches) >= limit:
+                    break
+                matches[symbol] = _symbol_to_row[symbol]
+        
+        # Then substring matches on ticker or name, each tested on its own so
+        # a query can't straddle the two
+        if len(matches) < limit:
+            for symbol, name, sec in _search_rows:
+                if len(matches) >= limit:
+                    break
+                if query_lower in symbol or query_lower in name:
+                    matches.setdefault(symbol, sec)
+        
+        # Finally fill with fuzzy matches to tolerate typos
+        if len(matches) < limit and query_lower:
+            for _, _, index in process.extract(
+                query_lower,
+                _search_choices,
+                scorer=fuzz.WRatio,
+                limit=limit,
+                score_cutoff=SEARCH_FUZZY_SCORE_CUTOFF
+            ):
+                if len(matches) >= limit:
+                    break
+                sec = MOCK_SECURITIES[index]
+                matches.setdefault(sec["symbol"].lower(), sec)
+        
+        results = list(matches.values())[:limit]
+        cache_set(key, results, SEARCH_CACHE_TTL_SEC)
+        return results
     except Exception as e:
         print(f"Error searching symbols for {query}: {e}", file=sys.stderr)
         return []
 
-def fetch_price_summary(symbol: str) -> Dict[str, Any]:
+async def fetch_price_summary_async(session: aiohttp.ClientSession, symbol: str) -> Dict[str, Any]:
+    """Fetch price summary, served from cache while fresh"""
+    key = cache_key("px:sum", symbol, SUMMARY_CACHE_TTL_SEC)
+    cached = await cache_get_async(key)
+    if cached is not None:
+        return cached
+    
+    if await is_known_failure_async("sum", symbol):
+        return None
+    
+    try:
+        result = await _fetch_price_summary_live(session, symbol)
+    except SymbolNotFoundError as e:
+        print(f"Error fetching price summary for {symbol}: {e}", file=sys.stderr)
+        await remember_failure_async("sum", symbol)
+        return None
+    
+    if result:
+        await cache_set_async(key, result, SUMMARY_CACHE_TTL_SEC)
+    return result
+
+async def _fetch_price_summary_live(session: aiohttp.ClientSession, symbol: str) -> Dict[str, Any]:
     """Fetch comprehensive price summary with 7-day mini chart"""
     try:
-        ticker = yf.Ticker(symbol)
+        # The 7-day daily series already ends with today's close, so the
+        # chart and the name/market cap lookup are the only two requests
+        chart, quote_summary = await asyncio.gather(
+            _yahoo_chart_async(session, symbol, "7d", "1d"),
+            _yahoo_get_json(session, YAHOO_QUOTE_SUMMARY_URL.format(symbol=symbol), QUOTE_SUMMARY_PARAMS),
+            return_exceptions=True
+        )
+        if isinstance(chart, Exception):
+            raise chart
+        
+        quote = chart.get("indicators", {}).get("quote") or [{}]
+        points = [
+            (ts * 1000, float(close))
+            for ts, close in zip(chart.get("timestamp") or [], quote[0].get("close") or [])
+            if close is not None
+        ]
+        if not points:
+            raise SymbolNotFoundError(f"No historical data found for {symbol}")
         
         # Get current price
-        hist_1d = ticker.history(period="1d")
-        if hist_1d.empty:
-            raise ValueError(f"No current data found for {symbol}")
-        
-        current_price = float(hist_1d['Close'].iloc[-1])
-        
-        # Get 7-day history for mini chart
-        hist_7d = ticker.history(period="7d")
-        if hist_7d.empty:
-            raise ValueError(f"No historical data found for {symbol}")
+        current_price = float(chart["meta"].get("regularMarketPrice") or points[-1][1])
         
         # Calculate 24h change
         change_24h = 0
         change_percent_24h = 0
-        if len(hist_7d) >= 2:
-            prev_close = float(hist_7d['Close'].iloc[-2])
+        if len(points) >= 2:
+            prev_close = points[-2][1]
             change_24h = current_price - prev_close
             change_percent_24h = (change_24h / prev_close) * 100 if prev_close > 0 else 0
         
         # Create mini chart data
-        mini_chart = []
-        for index, row in hist_7d.iterrows():
-            mini_chart.append({
-                "ts": int(index.to_pydatetime().timestamp() * 1000),
-                "close": float(row["Close"])
-            })
+        mini_chart = [{"ts": ts, "close": close} for ts, close in points]
         
         # Get basic info
-        info = ticker.info or {}
+        price_info = {}
+        if isinstance(quote_summary, Exception):
+            print(f"Quote summary failed for {symbol}: {quote_summary}", file=sys.stderr)
+        else:
+            result = (quote_summary.get("quoteSummary") or {}).get("result") or [{}]
+            price_info = result[0].get("price") or {}
+        
+        market_cap = price_info.get("marketCap")
+        if isinstance(market_cap, dict):
+            # Yahoo occasionally ignores formatted=false
+            market_cap = market_cap.get("raw")
         
         return {
             "symbol": symbol,
-            "name": info.get("longName", symbol),
+            "name": price_info.get("longName") or symbol,
             "price": current_price,
             "change24h": change_24h,
             "changePercent24h": change_percent_24h,
-            "marketCap": info.get("marketCap"),
+            "marketCap": market_cap,
             "miniChart": mini_chart,
             "asOf": datetime.now().isoformat(),
-            "source": "yfinance"
+            "source": "yahoo"
         }
+    except SymbolNotFoundError:
+        raise
     except Exception as e:
         print(f"Error fetching price summary for {symbol}: {e}", file=sys.stderr)
         return None
 
 def fetch_intraday_data(symbol: str, interval: str = "1m", lookback: str = "1d") -> Dict[str, Any]:
-    """Fetch intraday data with Polygon.io fallback to yfinance"""
+    """Fetch intraday data, served from cache for the current minute"""
+    # Bars only update once a minute, so key on the minute bucket
+    key = f"intraday:{symbol}:{interval}:{int(time.time() // 60)}"
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    if is_known_failure("intraday", symbol):
+        return None
+    
+    try:
+        result = _fetch_intraday_data_live(symbol, interval, lookback)
+    except SymbolNotFoundError as e:
+        print(f"Error fetching intraday data for {symbol}: {e}", file=sys.stderr)
+        remember_failure("intraday", symbol)
+        return None
+    
+    if result:
+        cache_set(key, result, INTRADAY_CACHE_TTL_SEC)
+    return result
+
+def _fetch_intraday_data_live(symbol: str, interval: str = "1m", lookback: str = "1d") -> Dict[str, Any]:
+    """Fetch intraday data with Polygon.io fallback to Yahoo's chart endpoint"""
     try:
         polygon_key = os.getenv("POLYGON_API_KEY")
         
@@ -194,27 +647,24 @@ def fetch_intraday_data(symbol: str, interval: str = "1m", lookback: str = "1d")
                 to_date = datetime.now()
                 
                 url = f"https://api.polygon.io/v2/aggs/ticker/{symbol}/range/1/minute/{from_date.strftime('%Y-%m-%d')}/{to_date.strftime('%Y-%m-%d')}"
+                # Newest bars first so the limit keeps the most recent ones;
+                # only the last 100 are returned, the rest is safety margin
                 params = {
                     "apikey": polygon_key,
-                    "sort": "asc",
-                    "limit": 50000
+                    "sort": "desc",
+                    "limit": 200
                 }
                 
-                response = requests.get(url, params=params)
+                response = _session.get(url, params=params, timeout=REQUESTS_TIMEOUT)
                 response.raise_for_status()
                 
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data.get("status") == "OK" and data.get("results"):
-                    candles = []
-                    for result in data["results"][-100:]:  # Last 100 data points
-                        candles.append({
-                            "ts": result["t"],
-                            "open": result["o"],
-                            "high": result["h"],
-                            "low": result["l"],
-                            "close": result["c"],
-                            "volume": result["v"]
-                        })
+                    # Only the last 100 data points are renamed into candles
+                    candles = [
+                        {"ts": r["t"], "open": r["o"], "high": r["h"], "low": r["l"], "close": r["c"], "volume": r["v"]}
+                        for r in reversed(data["results"][:100])
+                    ]
                     
                     return {
                         "symbol": symbol,
@@ -225,114 +675,227 @@ def fetch_intraday_data(symbol: str, interval: str = "1m", lookback: str = "1d")
             except Exception as e:
                 print(f"Polygon.io failed for {symbol}: {e}", file=sys.stderr)
         
-        # Fallback to yfinance
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period="1d", interval="1m")
+        # Fallback to Yahoo's chart endpoint
+        candles = _yahoo_candles(_yahoo_chart(symbol, "1d", "1m"))
         
-        if hist.empty:
+        if not candles:
             # If no intraday, get latest daily
-            hist = ticker.history(period="1d")
-        
-        candles = []
-        for index, row in hist.iterrows():
-            candles.append({
-                "ts": int(index.to_pydatetime().timestamp() * 1000),
-                "open": float(row["Open"]),
-                "high": float(row["High"]),
-                "low": float(row["Low"]),
-                "close": float(row["Close"]),
-                "volume": int(row["Volume"])
-            })
+            candles = _yahoo_candles(_yahoo_chart(symbol, "1d", "1d"))
+        
+        if not candles:
+            raise SymbolNotFoundError(f"No candles found for {symbol}")
         
         return {
             "symbol": symbol,
             "interval": interval,
             "candles": candles,
-            "source": "yfinance"
+            "source": "yahoo"
         }
         
+    except SymbolNotFoundError:
+        raise
     except Exception as e:
         print(f"Error fetching intraday data for {symbol}: {e}", file=sys.stderr)
         return None
 
+async def handle_request(input_data: Dict[str, Any], session: aiohttp.ClientSession) -> Any:
+    """Dispatch a decoded request to its fetcher and return the response payload"""
+    request_type = input_data.get("type")
+    
+    # Sync fetchers run in a worker thread so the serve() loop stays responsive
+    
+    # Handle search request
+    if request_type == "search":
+        query = input_data.get("query", "")
+        limit = input_data.get("limit", 10)
+        
+        return await asyncio.to_thread(search_equity_symbols, query, limit)
+    
+    # Handle price summary request
+    if request_type == "price_summary":
+        symbol = input_data.get("symbol")
+        if not symbol:
+            return {"error": "Symbol required for price summary"}
+        
+        result = await fetch_price_summary_async(session, symbol)
+        return result or {"error": f"Failed to fetch price summary for {symbol}"}
+    
+    # Check if this is an intraday request
+    if request_type == "intraday":
+        symbol = input_data.get("symbol")
+        interval = input_data.get("interval", "1m")
+        lookback = input_data.get("lookback", "1d")
+        
+        result = await asyncio.to_thread(fetch_intraday_data, symbol, interval, lookback)
+        return result or {"error": f"Failed to fetch intraday data for {symbol}"}
+    
+    # Original batch price fetching logic
+    equities = input_data.get("equities", [])
+    cryptos = input_data.get("cryptos", [])
+    
+    # Fetch equity and crypto prices concurrently
+    return await fetch_batch_prices(session, equities, cryptos)
+
+def emit(payload: Any) -> None:
+    """Write payload to stdout as a single JSON line"""
+    sys.stdout.buffer.write(orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE))
+    sys.stdout.buffer.flush()
+
+async def run_once(input_data: Dict[str, Any]) -> Any:
+    """Handle a single request with a short-lived HTTP session"""
+    try:
+        async with create_http_session() as session:
+            return await handle_request(input_data, session)
+    finally:
+        await _redis_async.aclose()
+
 def main():
     try:
         # Read input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = orjson.loads(sys.stdin.buffer.read())
         
-        request_type = input_data.get("type")
-        
-        # Handle search request
-        if request_type == "search":
-            query = input_data.get("query", "")
-            limit = input_data.get("limit", 10)
-            
-            results = search_equity_symbols(query, limit)
-            print(json.dumps(results))
-            return
-        
-        # Handle price summary request
-        if request_type == "price_summary":
-            symbol = input_data.get("symbol")
-            if not symbol:
-                print(json.dumps({"error": "Symbol required for price summary"}))
-                return
-            
-            result = fetch_price_summary(symbol)
-            if result:
-                print(json.dumps(result))
-            else:
-                print(json.dumps({"error": f"Failed to fetch price summary for {symbol}"}))
-            return
-        
-        # Check if this is an intraday request
-        if request_type == "intraday":
-            symbol = input_data.get("symbol")
-            interval = input_data.get("interval", "1m")
-            lookback = input_data.get("lookback", "1d")
-            
-            result = fetch_intraday_data(symbol, interval, lookback)
-            if result:
-                print(json.dumps(result))
-            else:
-                print(json.dumps({"error": f"Failed to fetch intraday data for {symbol}"}))
-            return
-        
-        # Original batch price fetching logic
-        equities = input_data.get("equities", [])
-        cryptos = input_data.get("cryptos", [])
-        
-        results = []
-        
-        # Symbol mapping for crypto
-        crypto_symbol_map = {
-            "BTC-USD": "bitcoin",
-            "ETH-USD": "ethereum",
-            "ADA-USD": "cardano",
-            "SOL-USD": "solana"
-        }
-        
-        # Reverse mapping for lookup
-        reverse_crypto_map = {v: k for k, v in crypto_symbol_map.items()}
-        
-        # Fetch equity prices
-        for symbol in equities:
-            price_data = fetch_equity_price(symbol)
-            if price_data:
-                results.append(price_data)
-        
-        # Fetch crypto prices
-        for crypto_id in cryptos:
-            price_data = fetch_crypto_price(crypto_id, reverse_crypto_map)
-            if price_data:
-                results.append(price_data)
-        
-        # Output results as JSON
-        print(json.dumps(results))
+        # Output result as JSON
+        emit(asyncio.run(run_once(input_data)))
         
     except Exception as e:
         print(f"Error in main: {e}", file=sys.stderr)
         sys.exit(1)
 
+async def warmup() -> None:
+    """Prefetch the sentiment indicators' intraday series into the caches"""
+    # Node only ever asks for intraday data, and the sentiment route asks for
+    # these symbols on every load; anything else is fetched when requested
+    await asyncio.gather(
+        *[asyncio.to_thread(fetch_intraday_data, symbol) for symbol in WARMUP_INTRADAY_SYMBOLS]
+    )
+
+async def warmup_loop() -> None:
+    """Re-run warmup just after each intraday cache bucket rolls over"""
+    while True:
+        try:
+            await warmup()
+            prune_l1_cache()
+        except Exception as e:
+            print(f"Warmup failed: {e}", file=sys.stderr)
+        
+        # Intraday keys are bucketed per minute
+        await asyncio.sleep(60 - time.time() % 60)
+
+def socket_in_use(path: str) -> bool:
+    """True if another daemon is accepting connections on the Unix socket"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except (FileNotFoundError, ConnectionRefusedError):
+        return False
+    finally:
+        probe.close()
+
+async def wait_for_stdin_eof() -> None:
+    """Return once stdin closes, i.e. when the parent process has gone away"""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    while await reader.read(4096):
+        pass
+
+async def serve(path: str = SOCKET_PATH, exit_with_parent: bool = False) -> None:
+    """Serve length-prefixed JSON requests over a Unix socket until cancelled"""
+    # Never take over a live daemon's socket; only clear a stale one
+    if socket_in_use(path):
+        print(f"Another service is already serving on {path}", file=sys.stderr)
+        sys.exit(1)
+    if os.path.exists(path):
+        os.unlink(path)
+    
+    session = create_http_session()
+    
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Each frame is a 4-byte big-endian length followed by a JSON body of
+        # {"id": n, "request": {...}}. Frames run concurrently and each reply,
+        # {"id": n, "result": ...}, is written as soon as it is ready, so one
+        # slow upstream never holds up the rest of the connection.
+        write_lock = asyncio.Lock()
+        tasks = set()
+        
+        async def respond(frame: Dict[str, Any]) -> None:
+            try:
+                result = await handle_request(frame.get("request") or {}, session)
+            except Exception as e:
+                print(f"Error handling request: {e}", file=sys.stderr)
+                result = {"error": f"Failed to handle request: {e}"}
+            
+            data = orjson.dumps({"id": frame.get("id"), "result": result})
+            try:
+                async with write_lock:
+                    writer.write(FRAME_HEADER.pack(len(data)) + data)
+                    await writer.drain()
+            except ConnectionError:
+                pass
+        
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(FRAME_HEADER.size)
+                    (length,) = FRAME_HEADER.unpack(header)
+                    if length > MAX_FRAME_BYTES:
+                        # The stream can't be resynchronised past a bad header
+                        print(f"Closing connection: {length}-byte frame exceeds {MAX_FRAME_BYTES}", file=sys.stderr)
+                        break
+                    body = await reader.readexactly(length)
+                except asyncio.IncompleteReadError:
+                    break
+                
+                # Without an id there is no request to answer
+                try:
+                    frame = orjson.loads(body)
+                except orjson.JSONDecodeError as e:
+                    print(f"Dropping malformed frame: {e}", file=sys.stderr)
+                    continue
+                if not isinstance(frame, dict):
+                    print(f"Dropping frame that is not an object: {type(frame).__name__}", file=sys.stderr)
+                    continue
+                
+                task = asyncio.create_task(respond(frame))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+    
+    server = await asyncio.start_unix_server(handle, path=path)
+    socket_inode = os.stat(path).st_ino
+    print(f"Serving on {path}", file=sys.stderr)
+    
+    # Warm the caches in the background so the first requests are hits
+    warmup_task = asyncio.create_task(warmup_loop())
+    
+    tasks = {asyncio.create_task(server.serve_forever())}
+    if exit_with_parent:
+        # The spawning process holds our stdin open; EOF means it is gone
+        tasks.add(asyncio.create_task(wait_for_stdin_eof()))
+    
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks | {warmup_task}:
+            task.cancel()
+        server.close()
+        # Leave the path alone if a newer daemon has since bound it
+        try:
+            if os.stat(path).st_ino == socket_inode:
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+        await session.close()
+        await _redis_async.aclose()
+
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ["serve"]:
+        asyncio.run(serve(exit_with_parent="--exit-with-parent" in sys.argv[2:]))
+    else:
+        main()
@@ -0,0 +1,154 @@
+import asyncio
+
+import aiohttp
+import pytest
+import requests
+from yarl import URL
+
+import main
+
+
+class FakeResponse:
+    """Just enough of aiohttp.ClientResponse for the async fetchers"""
+
+    def __init__(self, status: int, body: bytes = b"{}"):
+        self.status = status
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            request_info = aiohttp.RequestInfo(URL(main.YAHOO_CHART_URL), "GET", {})
+            raise aiohttp.ClientResponseError(request_info, (), status=self.status)
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class FakeSession:
+    """Stands in for the shared aiohttp session, answering every GET with `reply`"""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    def get(self, url, params=None, headers=None):
+        self.calls.append((url, params))
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return self.reply
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch):
+    # L1 only: keep Redis in its cooldown and start every test with empty caches
+    monkeypatch.setattr(main, "_redis_retry_at", float("inf"))
+    monkeypatch.setattr(main, "_l1_cache", {})
+    for name in ("ALPHA_VANTAGE_API_KEY", "POLYGON_API_KEY", "COINGECKO_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def stub_yahoo_chart(monkeypatch, outcome):
+    """Replace the sync Yahoo chart call with one that returns or raises outcome"""
+    calls = []
+
+    def fake_chart(symbol, range_, interval):
+        calls.append((symbol, range_, interval))
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(main, "_yahoo_chart", fake_chart)
+    return calls
+
+
+@pytest.mark.parametrize("outcome", [
+    main.SymbolNotFoundError("No data found for ZZZZ"),
+    {"meta": {}, "timestamp": [], "indicators": {"quote": [{}]}},
+])
+def test_intraday_missing_symbol_is_negatively_cached(monkeypatch, outcome):
+    calls = stub_yahoo_chart(monkeypatch, outcome)
+
+    assert main.fetch_intraday_data("ZZZZ") is None
+    assert main.cache_get("neg:intraday:ZZZZ") is not None
+
+    upstream_calls = len(calls)
+    assert main.fetch_intraday_data("ZZZZ") is None
+    assert len(calls) == upstream_calls
+
+
+@pytest.mark.parametrize("outcome", [
+    requests.Timeout("read timed out"),
+    requests.HTTPError("503 Server Error"),
+    requests.HTTPError("429 Too Many Requests"),
+])
+def test_intraday_transient_error_is_not_negatively_cached(monkeypatch, outcome):
+    calls = stub_yahoo_chart(monkeypatch, outcome)
+
+    assert main.fetch_intraday_data("SPY") is None
+    assert main.cache_get("neg:intraday:SPY") is None
+
+    main.fetch_intraday_data("SPY")
+    assert len(calls) == 2
+
+
+def test_equity_404_is_negatively_cached():
+    session = FakeSession(FakeResponse(404))
+
+    assert asyncio.run(main.fetch_equity_price_async(session, "ZZZZ")) is None
+    assert main.cache_get("neg:eq:ZZZZ") is not None
+
+    assert asyncio.run(main.fetch_equity_price_async(session, "ZZZZ")) is None
+    assert len(session.calls) == 1
+
+
+@pytest.mark.parametrize("reply", [FakeResponse(503), FakeResponse(429), asyncio.TimeoutError()])
+def test_equity_transient_error_is_not_negatively_cached(reply):
+    session = FakeSession(reply)
+
+    assert asyncio.run(main.fetch_equity_price_async(session, "AAPL")) is None
+    assert main.cache_get("neg:eq:AAPL") is None
+
+    asyncio.run(main.fetch_equity_price_async(session, "AAPL"))
+    assert len(session.calls) == 2
+
+
+def test_crypto_bulk_keeps_input_order_on_partial_cache_hit():
+    cached_eth = {"symbol": "ETH-USD", "assetType": "crypto", "close": 2.0, "date": "2024-01-01", "source": "coingecko"}
+    main.cache_set(main.cache_key("px:cx", "ethereum", main.PRICE_CACHE_TTL_SEC), cached_eth, main.PRICE_CACHE_TTL_SEC)
+    session = FakeSession(FakeResponse(200, b'{"bitcoin": {"usd": 1.0}, "solana": {"usd": 3.0}}'))
+
+    prices = asyncio.run(main.fetch_crypto_prices_bulk_async(session, ["bitcoin", "ethereum", "solana"]))
+
+    assert [price["symbol"] for price in prices] == ["BTC-USD", "ETH-USD", "SOL-USD"]
+    # Only the ids missing from the cache go upstream
+    assert session.calls[0][1]["ids"] == "bitcoin,solana"
+
+
+def test_crypto_id_missing_from_response_is_negatively_cached():
+    session = FakeSession(FakeResponse(200, b'{"bitcoin": {"usd": 1.0}}'))
+
+    prices = asyncio.run(main.fetch_crypto_prices_bulk_async(session, ["bitcoin", "notacoin"]))
+
+    assert [price["symbol"] for price in prices] == ["BTC-USD"]
+    assert main.cache_get("neg:cx:notacoin") is not None
+    assert main.cache_get("neg:cx:bitcoin") is None
+
+
+def test_search_substring_does_not_straddle_symbol_and_name(monkeypatch):
+    # Fuzzy matching tolerates this by design; check only the substring stage
+    monkeypatch.setattr(main.process, "extract", lambda *args, **kwargs: [])
+
+    assert "AAPL" not in [sec["symbol"] for sec in main.search_equity_symbols("l apple")]
+    assert main.search_equity_symbols("apple")[0]["symbol"] == "AAPL"
+
+
+def test_search_empty_query_keeps_universe_order():
+    results = main.search_equity_symbols("", limit=5)
+
+    assert results == main.MOCK_SECURITIES[:5]
@@ -0,0 +1,158 @@
+import { describe, it, expect, beforeEach, afterEach, vi } from "vitest";
+import { EventEmitter } from "events";
+import type { ChildProcess } from "child_process";
+import fs from "fs";
+import net from "net";
+import os from "os";
+import path from "path";
+import { PythonService } from "../python-service";
+
+interface Frame {
+  id: number;
+  request: any;
+}
+
+function encode(message: unknown): Buffer {
+  const body = Buffer.from(JSON.stringify(message));
+  const header = Buffer.alloc(4);
+  header.writeUInt32BE(body.length);
+  return Buffer.concat([header, body]);
+}
+
+/**
+ * Minimal stand-in for `python/main.py serve`: decodes frames and hands each
+ * one to `onFrame` along with the connection so tests control reply order.
+ */
+function startFakeService(socketPath: string, onFrame: (frame: Frame, socket: net.Socket) => void) {
+  const sockets = new Set<net.Socket>();
+  const server = net.createServer((socket) => {
+    sockets.add(socket);
+    let buffer = Buffer.alloc(0);
+    socket.on("data", (chunk) => {
+      buffer = Buffer.concat([buffer, chunk]);
+      while (buffer.length >= 4 && buffer.length >= 4 + buffer.readUInt32BE(0)) {
+        const length = buffer.readUInt32BE(0);
+        onFrame(JSON.parse(buffer.subarray(4, 4 + length).toString()), socket);
+        buffer = buffer.subarray(4 + length);
+      }
+    });
+    socket.on("close", () => sockets.delete(socket));
+  });
+
+  return new Promise<{ sockets: Set<net.Socket>; close: () => Promise<void> }>((resolve) => {
+    server.listen(socketPath, () =>
+      resolve({
+        sockets,
+        close: () => {
+          sockets.forEach((socket) => socket.destroy());
+          return new Promise((done) => server.close(() => done()));
+        },
+      })
+    );
+  });
+}
+
+function fakeDaemon(): ChildProcess {
+  const daemon = Object.assign(new EventEmitter(), { exitCode: null as number | null, kill: vi.fn() });
+  // Simulate a daemon that crashes on startup
+  setImmediate(() => {
+    daemon.exitCode = 1;
+    daemon.emit("exit", 1);
+  });
+  return daemon as unknown as ChildProcess;
+}
+
+describe("PythonService", () => {
+  let dir: string;
+  let socketPath: string;
+
+  beforeEach(() => {
+    dir = fs.mkdtempSync(path.join(os.tmpdir(), "python-service-"));
+    socketPath = path.join(dir, "service.sock");
+  });
+
+  afterEach(() => {
+    fs.rmSync(dir, { recursive: true, force: true });
+  });
+
+  it("resolves replies by id when they arrive out of order", async () => {
+    const frames: Array<[Frame, net.Socket]> = [];
+    const service = await startFakeService(socketPath, (frame, socket) => {
+      frames.push([frame, socket]);
+      if (frames.length === 2) {
+        // Answer the second request before the first
+        for (const [{ id, request }, conn] of [...frames].reverse()) {
+          conn.write(encode({ id, result: { symbol: request.symbol } }));
+        }
+      }
+    });
+    const client = new PythonService({ socketPath });
+
+    const [first, second] = await Promise.all([
+      client.request({ type: "intraday", symbol: "SPY" }),
+      client.request({ type: "intraday", symbol: "^VIX" }),
+    ]);
+
+    expect(first).toEqual({ symbol: "SPY" });
+    expect(second).toEqual({ symbol: "^VIX" });
+    client.close();
+    await service.close();
+  });
+
+  it("reassembles frames split across chunks and several frames in one chunk", async () => {
+    const frames: Frame[] = [];
+    const service = await startFakeService(socketPath, (frame, socket) => {
+      frames.push(frame);
+      if (frames.length < 2) return;
+
+      const data = Buffer.concat(frames.map(({ id }) => encode({ id, result: { id, ok: true } })));
+      // The first chunk ends mid-header, the rest arrives later in one piece
+      socket.write(data.subarray(0, 2));
+      setTimeout(() => socket.write(data.subarray(2)), 10);
+    });
+    const client = new PythonService({ socketPath });
+
+    const results = await Promise.all([client.request({ a: 1 }), client.request({ b: 2 })]);
+
+    expect(results.map((result) => result.ok)).toEqual([true, true]);
+    client.close();
+    await service.close();
+  });
+
+  it("times out a hung request without affecting later ones", async () => {
+    const service = await startFakeService(socketPath, ({ id, request }, socket) => {
+      if (!request.hang) socket.write(encode({ id, result: "ok" }));
+    });
+    const client = new PythonService({ socketPath, requestTimeoutMs: 50 });
+
+    await expect(client.request({ hang: true })).rejects.toThrow(/timed out/);
+    await expect(client.request({ hang: false })).resolves.toBe("ok");
+    client.close();
+    await service.close();
+  });
+
+  it("rejects pending requests when the connection closes", async () => {
+    const service = await startFakeService(socketPath, (_frame, socket) => socket.destroy());
+    const client = new PythonService({ socketPath });
+
+    await expect(client.request({ type: "intraday", symbol: "SPY" })).rejects.toThrow(/closed/);
+    client.close();
+    await service.close();
+  });
+
+  it("falls back to one-shot and stops respawning while the daemon keeps failing", async () => {
+    const spawnDaemon = vi.fn(fakeDaemon);
+    const runOnce = vi.fn(async () => "one-shot" as any);
+    const client = new PythonService({ socketPath, spawnDaemon, runOnce, initialBackoffMs: 60000 });
+
+    const started = Date.now();
+    await expect(client.request({ type: "intraday" })).resolves.toBe("one-shot");
+    await expect(client.request({ type: "intraday" })).resolves.toBe("one-shot");
+
+    // The dead daemon is noticed immediately instead of waiting out the
+    // connect timeout, and the open breaker skips spawning for the second call
+    expect(Date.now() - started).toBeLessThan(1000);
+    expect(spawnDaemon).toHaveBeenCalledTimes(1);
+    expect(runOnce).toHaveBeenCalledTimes(2);
+  });
+});
@@ -0,0 +1,274 @@
+import { spawn, type ChildProcess } from "child_process";
+import fs from "fs";
+import net from "net";
+
+const FRAME_HEADER_BYTES = 4;
+
+interface PendingRequest {
+  resolve: (value: any) => void;
+  reject: (error: Error) => void;
+  timer: NodeJS.Timeout;
+}
+
+export interface PythonServiceOptions {
+  socketPath?: string;
+  requestTimeoutMs?: number;
+  connectTimeoutMs?: number;
+  connectRetryMs?: number;
+  // After a failed start the daemon is skipped for this long, doubling per
+  // consecutive failure up to the max, and requests run one-shot instead
+  initialBackoffMs?: number;
+  maxBackoffMs?: number;
+  spawnDaemon?: () => ChildProcess;
+  runOnce?: <T>(payload: unknown) => Promise<T>;
+}
+
+/**
+ * Client for the long-lived Python price service (`python/main.py serve`).
+ *
+ * Requests are sent as length-prefixed JSON frames over a single persistent
+ * Unix socket, so interpreter startup, imports and the HTTP/Redis clients are
+ * paid for once instead of per request. Each frame carries an id; the service
+ * runs frames concurrently and replies as each one finishes, in any order.
+ */
+export class PythonService {
+  private socket: net.Socket | null = null;
+  private connecting: Promise<net.Socket> | null = null;
+  private daemon: ChildProcess | null = null;
+  private buffer = Buffer.alloc(0);
+  private pending = new Map<number, PendingRequest>();
+  private nextId = 1;
+  private backoffMs: number;
+  private retryAt = 0;
+
+  private readonly socketPath: string;
+  private readonly requestTimeoutMs: number;
+  private readonly connectTimeoutMs: number;
+  private readonly connectRetryMs: number;
+  private readonly initialBackoffMs: number;
+  private readonly maxBackoffMs: number;
+  private readonly spawnDaemon: () => ChildProcess;
+  private readonly runOnce: <T>(payload: unknown) => Promise<T>;
+
+  constructor(options: PythonServiceOptions = {}) {
+    this.socketPath = options.socketPath ?? (process.env.PRICE_SERVICE_SOCKET || "/tmp/finai.sock");
+    this.requestTimeoutMs = options.requestTimeoutMs ?? 30000;
+    this.connectTimeoutMs = options.connectTimeoutMs ?? 10000;
+    this.connectRetryMs = options.connectRetryMs ?? 100;
+    this.initialBackoffMs = options.initialBackoffMs ?? 1000;
+    this.maxBackoffMs = options.maxBackoffMs ?? 60000;
+    this.backoffMs = this.initialBackoffMs;
+    this.spawnDaemon = options.spawnDaemon ?? spawnPythonDaemon;
+    this.runOnce = options.runOnce ?? runPythonOnce;
+  }
+
+  async request<T = any>(payload: unknown): Promise<T> {
+    // Circuit open: the daemon failed to start recently, don't wait on it again
+    if (Date.now() < this.retryAt) {
+      return this.runOnce<T>(payload);
+    }
+
+    let socket: net.Socket;
+    try {
+      socket = await this.connect();
+    } catch (error) {
+      console.warn("Python service unavailable, running one-shot:", (error as Error).message);
+      return this.runOnce<T>(payload);
+    }
+
+    const id = this.nextId++;
+    const body = Buffer.from(JSON.stringify({ id, request: payload }));
+    const header = Buffer.alloc(FRAME_HEADER_BYTES);
+    header.writeUInt32BE(body.length);
+
+    return new Promise<T>((resolve, reject) => {
+      // A hung reply only fails its own request; a late answer is dropped
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`Python service request timed out after ${this.requestTimeoutMs}ms`));
+      }, this.requestTimeoutMs);
+
+      this.pending.set(id, { resolve, reject, timer });
+      socket.write(Buffer.concat([header, body]));
+    });
+  }
+
+  /**
+   * Drop the connection and stop the daemon this client started, if any.
+   */
+  close(): void {
+    this.socket?.destroy();
+    this.daemon?.kill();
+    this.daemon = null;
+  }
+
+  private connect(): Promise<net.Socket> {
+    if (this.socket) return Promise.resolve(this.socket);
+    if (!this.connecting) {
+      this.connecting = this.openSocket()
+        .then((socket) => {
+          this.backoffMs = this.initialBackoffMs;
+          return socket;
+        })
+        .catch((error) => {
+          this.retryAt = Date.now() + this.backoffMs;
+          this.backoffMs = Math.min(this.backoffMs * 2, this.maxBackoffMs);
+          throw error;
+        })
+        .finally(() => {
+          this.connecting = null;
+        });
+    }
+    return this.connecting;
+  }
+
+  private async openSocket(): Promise<net.Socket> {
+    try {
+      return this.attach(await tryConnect(this.socketPath));
+    } catch {
+      // Nothing listening yet - start the daemon once and wait for its socket
+    }
+
+    const daemon = this.ensureDaemon();
+    let exited = daemon.exitCode !== null;
+    daemon.once("exit", () => {
+      exited = true;
+    });
+
+    const deadline = Date.now() + this.connectTimeoutMs;
+    while (true) {
+      try {
+        return this.attach(await tryConnect(this.socketPath));
+      } catch (error) {
+        if (exited) throw new Error("Python service exited during startup");
+        if (Date.now() >= deadline) throw error;
+        await new Promise(resolve => setTimeout(resolve, this.connectRetryMs));
+      }
+    }
+  }
+
+  private ensureDaemon(): ChildProcess {
+    if (this.daemon && this.daemon.exitCode === null) return this.daemon;
+
+    const daemon = this.spawnDaemon();
+    this.daemon = daemon;
+    daemon.on("exit", (code) => {
+      console.warn(`Python service exited with code ${code}`);
+      if (this.daemon === daemon) this.daemon = null;
+    });
+    return daemon;
+  }
+
+  private attach(socket: net.Socket): net.Socket {
+    this.socket = socket;
+    this.buffer = Buffer.alloc(0);
+
+    socket.on("data", (chunk) => {
+      this.buffer = Buffer.concat([this.buffer, chunk]);
+
+      while (this.buffer.length >= FRAME_HEADER_BYTES) {
+        const length = this.buffer.readUInt32BE(0);
+        if (this.buffer.length < FRAME_HEADER_BYTES + length) break;
+
+        const body = this.buffer.subarray(FRAME_HEADER_BYTES, FRAME_HEADER_BYTES + length);
+        this.buffer = this.buffer.subarray(FRAME_HEADER_BYTES + length);
+
+        let frame: { id: number; result: unknown };
+        try {
+          frame = JSON.parse(body.toString());
+        } catch (error) {
+          console.error("Dropping malformed Python service frame:", error);
+          continue;
+        }
+
+        const request = this.pending.get(frame.id);
+        if (!request) continue;
+        this.pending.delete(frame.id);
+        clearTimeout(request.timer);
+        request.resolve(frame.result);
+      }
+    });
+
+    const reset = (error?: Error) => {
+      if (this.socket !== socket) return;
+      this.socket = null;
+      const pending = this.pending;
+      this.pending = new Map();
+      pending.forEach(({ reject, timer }) => {
+        clearTimeout(timer);
+        reject(new Error(`Python service connection closed${error ? `: ${error.message}` : ""}`));
+      });
+    };
+    socket.on("error", reset);
+    socket.on("close", () => reset());
+    return socket;
+  }
+}
+
+function tryConnect(path: string): Promise<net.Socket> {
+  return new Promise((resolve, reject) => {
+    if (!fs.existsSync(path)) {
+      reject(new Error(`Socket ${path} not found`));
+      return;
+    }
+
+    const socket = net.createConnection(path);
+    socket.once("connect", () => {
+      socket.removeListener("error", reject);
+      resolve(socket);
+    });
+    socket.once("error", reject);
+  });
+}
+
+const daemons = new Set<ChildProcess>();
+process.once("exit", () => {
+  daemons.forEach((daemon) => daemon.kill());
+});
+
+/**
+ * Start `python/main.py serve` tied to the lifetime of this process.
+ */
+function spawnPythonDaemon(): ChildProcess {
+  // The daemon exits when its stdin pipe closes, so it can't outlive Node even
+  // after a crash or SIGKILL; the exit hook covers a normal shutdown
+  const daemon = spawn("python", ["python/main.py", "serve", "--exit-with-parent"], {
+    stdio: ["pipe", "ignore", "inherit"],
+  });
+  daemons.add(daemon);
+  daemon.once("exit", () => daemons.delete(daemon));
+  return daemon;
+}
+
+/**
+ * Run a single request through a fresh `python/main.py` process (stdin/stdout).
+ */
+export function runPythonOnce<T = any>(payload: unknown): Promise<T> {
+  return new Promise<T>((resolve, reject) => {
+    const pythonProcess = spawn("python", ["python/main.py"], {
+      stdio: ["pipe", "pipe", "pipe"],
+    });
+
+    pythonProcess.stdin.write(JSON.stringify(payload));
+    pythonProcess.stdin.end();
+
+    let pythonOutput = "";
+    pythonProcess.stdout.on("data", (data) => {
+      pythonOutput += data.toString();
+    });
+
+    pythonProcess.on("close", (code) => {
+      if (code !== 0) {
+        reject(new Error(`Python process exited with code ${code}`));
+        return;
+      }
+      try {
+        resolve(JSON.parse(pythonOutput));
+      } catch (error) {
+        reject(error as Error);
+      }
+    });
+  });
+}
+
+export const pythonService = new PythonService();
@@ -13,7 +13,7 @@ import {
   newsStreamSchema,
   newsAnalyzeSchema,
 } from "@shared/schema";
-import { spawn } from "child_process";
+import { pythonService } from "./python-service";
 import { z } from "zod";
 import { ZodError } from "zod";
 import OpenAI from "openai";
@@ -287,30 +287,12 @@ export async function registerRoutes(app: Express): Promise<Server> {
       };
 
       // Call Python service
-      const pythonProcess = spawn("python", ["python/main.py"], {
-        stdio: ["pipe", "pipe", "pipe"],
-      });
-
-      pythonProcess.stdin.write(JSON.stringify(requestData));
-      pythonProcess.stdin.end();
-
-      let pythonOutput = "";
-      pythonProcess.stdout.on("data", (data) => {
-        pythonOutput += data.toString();
-      });
-
-      pythonProcess.on("close", async (code) => {
-        if (code === 0) {
-          try {
-            const intradayData = JSON.parse(pythonOutput);
-            res.json(intradayData);
-          } catch (error) {
-            res.status(500).json({ error: "Failed to parse intraday data" });
-          }
-        } else {
-          res.status(500).json({ error: "Failed to fetch intraday data" });
-        }
-      });
+      try {
+        const intradayData = await pythonService.request(requestData);
+        res.json(intradayData);
+      } catch (error) {
+        res.status(500).json({ error: "Failed to fetch intraday data" });
+      }
     } catch (error) {
       res.status(400).json({ error: "Invalid request parameters" });
     }
@@ -331,31 +313,12 @@ export async function registerRoutes(app: Express): Promise<Server> {
           lookback: "1d",
         };
 
-        const pythonProcess = spawn("python", ["python/main.py"], {
-          stdio: ["pipe", "pipe", "pipe"],
-        });
-
-        pythonProcess.stdin.write(JSON.stringify(requestData));
-        pythonProcess.stdin.end();
-
-        let pythonOutput = "";
-        pythonProcess.stdout.on("data", (data) => {
-          pythonOutput += data.toString();
-        });
-
-        await new Promise((resolve) => {
-          pythonProcess.on("close", (code) => {
-            if (code === 0) {
-              try {
-                const data = JSON.parse(pythonOutput);
-                sentimentData.push({ symbol, data });
-              } catch (error) {
-                console.error(`Failed to parse data for ${symbol}:`, error);
-              }
-            }
-            resolve(null);
-          });
-        });
+        try {
+          const data = await pythonService.request(requestData);
+          sentimentData.push({ symbol, data });
+        } catch (error) {
+          console.error(`Failed to fetch data for ${symbol}:`, error);
+        }
       }
 
       // Calculate sentiment score and drivers